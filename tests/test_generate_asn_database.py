@@ -0,0 +1,300 @@
+"""
+test_generate_asn_database.py
+Tests for the response cache, fallback strategies and output of generate_asn_database.py
+
+Run with: python -m unittest discover -s tests
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import generate_asn_database as gen  # noqa: E402
+
+REAL_ASYNC_CLIENT = httpx.AsyncClient
+PEERINGDB_HOST = httpx.URL(gen.PEERINGDB_API).host
+RIPE_HOST = httpx.URL(gen.RIPE_RIS_ASNS_API).host
+# Enough ASNs beyond the known ones to clear MIN_EXPECTED_ENTRIES
+FILLER_ASNS = range(4200000000, 4200000000 + gen.MIN_EXPECTED_ENTRIES)
+
+
+def make_peeringdb_body(**overrides) -> bytes:
+    """Build a PeeringDB /net response that passes validation."""
+    asns = [int(asn) for asn in gen.get_known_asn_keys()] + list(FILLER_ASNS)
+    networks = [{"asn": asn, "name": f"Network {asn}", "info_type": "NSP"} for asn in asns]
+    networks[0].update(overrides)
+    return json.dumps({"data": networks}).encode("utf-8")
+
+
+def make_ripe_body() -> bytes:
+    """Build a RIPE ris-asns response that passes validation."""
+    asns = [int(asn) for asn in gen.get_known_asn_keys()] + list(FILLER_ASNS)
+    return json.dumps({"data": {"asns": asns}}).encode("utf-8")
+
+
+def serve(body: bytes, etag: str = None):
+    """Handler returning body with an optional ETag, or 304 when the client already has it."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=body, headers={"ETag": etag} if etag else {})
+    return handler
+
+
+def fail(request: httpx.Request) -> httpx.Response:
+    """Handler simulating an upstream outage."""
+    return httpx.Response(500)
+
+
+class GeneratorTestCase(unittest.TestCase):
+    """Runs main() against a temporary output file and cache with mocked upstreams."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_path = Path(tmp_dir.name)
+        self.output_file = self.tmp_path / "asn_database.json"
+
+        for name, value in (
+            ("OUTPUT_FILE", self.output_file),
+            ("CACHE_DIR", self.tmp_path / ".asn_cache"),
+            ("RETRY_DELAY_SECONDS", 0),
+        ):
+            patcher = mock.patch.object(gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.handlers = {PEERINGDB_HOST: serve(make_peeringdb_body()), RIPE_HOST: serve(make_ripe_body())}
+        self.requests: list[httpx.Request] = []
+        patcher = mock.patch.object(gen.httpx, "AsyncClient", self.make_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.clear_run_caches()
+        self.addCleanup(self.clear_run_caches)
+
+    def make_client(self, **kwargs) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return self.handlers[request.url.host](request)
+        return REAL_ASYNC_CLIENT(transport=httpx.MockTransport(handler), **kwargs)
+
+    @staticmethod
+    def clear_run_caches():
+        gen.get_timestamp.cache_clear()
+        gen.load_existing_database.cache_clear()
+
+    def run_main(self) -> int:
+        """Run one generator pass as a separate invocation would, returning its exit code."""
+        self.clear_run_caches()
+        self.requests.clear()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                gen.main()
+        except SystemExit as e:
+            return e.code
+        return 0
+
+    def read_output(self) -> dict:
+        return json.loads(self.output_file.read_bytes())
+
+    def requests_to(self, host: str) -> list[httpx.Request]:
+        return [request for request in self.requests if request.url.host == host]
+
+    def age_cache(self, url: str, seconds: float) -> float:
+        """Pretend the cached response for url was fetched seconds ago; returns the new fetched_at."""
+        meta = gen.load_cache_meta(url)
+        meta["fetched_at"] = time.time() - seconds
+        gen.save_cache_meta(url, meta)
+        return meta["fetched_at"]
+
+
+class ResponseCacheTests(GeneratorTestCase):
+
+    def test_fresh_run_caches_both_sources(self):
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.read_output()["source"], "PeeringDB")
+        for url in (gen.PEERINGDB_API, gen.RIPE_RIS_ASNS_API):
+            body_path, meta_path = gen.get_cache_paths(url)
+            self.assertTrue(body_path.exists(), url)
+            self.assertTrue(meta_path.exists(), url)
+
+    def test_ttl_hit_skips_requests_and_keeps_fetch_time(self):
+        self.run_main()
+        fetched_at = self.age_cache(gen.PEERINGDB_API, 2 * 60 * 60)
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.requests, [])
+        expected = gen.format_timestamp(gen.datetime.fromtimestamp(fetched_at, gen.timezone.utc))
+        self.assertEqual(self.read_output()["updated_at"], expected)
+
+    def test_not_modified_reuses_cached_body(self):
+        self.handlers[PEERINGDB_HOST] = serve(make_peeringdb_body(), etag='"v1"')
+        self.handlers[RIPE_HOST] = serve(make_ripe_body(), etag='"r1"')
+        self.run_main()
+        self.age_cache(gen.PEERINGDB_API, gen.PEERINGDB_CACHE_TTL_SECONDS + 60)
+        self.age_cache(gen.RIPE_RIS_ASNS_API, gen.RIPE_CACHE_TTL_SECONDS + 60)
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual([request.headers.get("If-None-Match") for request in self.requests_to(PEERINGDB_HOST)], ['"v1"'])
+        self.assertEqual([request.headers.get("If-None-Match") for request in self.requests_to(RIPE_HOST)], ['"r1"'])
+        self.assertEqual(self.read_output()["updated_at"], gen.get_timestamp())
+
+    def test_unparseable_cached_body_is_discarded_and_refetched(self):
+        body = make_peeringdb_body()
+        self.handlers[PEERINGDB_HOST] = serve(body, etag='"v1"')
+        self.run_main()
+        body_path, _ = gen.get_cache_paths(gen.PEERINGDB_API)
+        body_path.write_bytes(body[: len(body) // 2])
+        self.age_cache(gen.PEERINGDB_API, gen.PEERINGDB_CACHE_TTL_SECONDS + 60)
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(
+            [request.headers.get("If-None-Match") for request in self.requests_to(PEERINGDB_HOST)],
+            ['"v1"', None],
+        )
+        self.assertEqual(self.read_output()["source"], "PeeringDB")
+        self.assertEqual(body_path.read_bytes(), body)
+
+    def test_unparseable_fresh_cache_is_fetched_unconditionally(self):
+        body = make_peeringdb_body()
+        self.handlers[PEERINGDB_HOST] = serve(body, etag='"v1"')
+        self.run_main()
+        body_path, _ = gen.get_cache_paths(gen.PEERINGDB_API)
+        body_path.write_bytes(body[: len(body) // 2])
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual([request.headers.get("If-None-Match") for request in self.requests_to(PEERINGDB_HOST)], [None])
+        self.assertEqual(body_path.read_bytes(), body)
+
+    def test_response_failing_validation_is_not_cached(self):
+        self.run_main()
+        body_path, _ = gen.get_cache_paths(gen.PEERINGDB_API)
+        good_body = body_path.read_bytes()
+        self.age_cache(gen.PEERINGDB_API, gen.PEERINGDB_CACHE_TTL_SECONDS + 60)
+        self.handlers[PEERINGDB_HOST] = serve(json.dumps({"data": [{"asn": 1, "name": "x"}]}).encode("utf-8"))
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(body_path.read_bytes(), good_body)
+        self.assertEqual(self.read_output()["source"], "PeeringDB + RIPE NCC RIS")
+
+    def test_no_temporary_files_are_left_behind(self):
+        self.run_main()
+        self.assertEqual(list(self.tmp_path.rglob("*.tmp")), [])
+
+
+class FallbackStrategyTests(GeneratorTestCase):
+
+    def prime_cache_then_fail(self, age_seconds: float, keep_output: bool):
+        """Cache both sources, age them, and take both upstreams down."""
+        self.run_main()
+        for url in (gen.PEERINGDB_API, gen.RIPE_RIS_ASNS_API):
+            fetched_at = self.age_cache(url, age_seconds)
+        if not keep_output:
+            self.output_file.unlink()
+        self.handlers = {PEERINGDB_HOST: fail, RIPE_HOST: fail}
+        return fetched_at
+
+    def test_fresh_ripe_is_preferred_over_stale_peeringdb_cache(self):
+        self.prime_cache_then_fail(30 * 24 * 60 * 60, keep_output=True)
+        self.handlers[RIPE_HOST] = serve(make_ripe_body())
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.read_output()["source"], "PeeringDB + RIPE NCC RIS")
+
+    def test_existing_database_is_kept_when_all_sources_fail(self):
+        self.prime_cache_then_fail(3 * 24 * 60 * 60, keep_output=True)
+        existing = self.output_file.read_bytes()
+
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.output_file.read_bytes(), existing)
+
+    def test_stale_cache_is_used_without_existing_database(self):
+        fetched_at = self.prime_cache_then_fail(3 * 24 * 60 * 60, keep_output=False)
+
+        self.assertEqual(self.run_main(), 0)
+        database = self.read_output()
+        self.assertEqual(database["source"], "PeeringDB")
+        self.assertNotEqual(database["updated_at"], gen.get_timestamp())
+        fetched = gen.datetime.fromtimestamp(gen.load_cache_meta(gen.PEERINGDB_API)["fetched_at"], gen.timezone.utc)
+        self.assertEqual(database["updated_at"], gen.format_timestamp(fetched))
+        self.assertLess(abs(fetched.timestamp() - fetched_at), 1)
+
+    def test_expired_stale_cache_is_not_used(self):
+        self.prime_cache_then_fail(gen.STALE_CACHE_MAX_AGE_SECONDS + 60, keep_output=False)
+
+        self.assertEqual(self.run_main(), 1)
+        self.assertFalse(self.output_file.exists())
+
+    def test_non_string_info_type_is_stored_as_is(self):
+        self.handlers[PEERINGDB_HOST] = serve(make_peeringdb_body(info_type=["NSP"]))
+
+        self.assertEqual(self.run_main(), 0)
+        database = self.read_output()
+        self.assertEqual(database["source"], "PeeringDB")
+        self.assertIn({"name": mock.ANY, "type": ["NSP"]}, database["entries"].values())
+
+    def test_transform_error_only_fails_that_source(self):
+        with mock.patch.object(gen, "transform_peeringdb_data", side_effect=KeyError("boom")):
+            self.assertEqual(self.run_main(), 0)
+        self.assertEqual(self.read_output()["source"], "RIPE NCC RIS")
+
+
+class KnownAsnTests(unittest.TestCase):
+
+    def load_from(self, text: str) -> dict[str, list[str]]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "known_asns.tsv"
+            path.write_text(text, encoding="utf-8")
+            with mock.patch.object(gen, "KNOWN_ASNS_FILE", path):
+                gen.load_known_asns.cache_clear()
+                try:
+                    return gen.load_known_asns()
+                finally:
+                    gen.load_known_asns.cache_clear()
+
+    def test_keeps_every_label_and_skips_comments(self):
+        known_asns = self.load_from("# comment\n\n15169\tGoogle\n15169\tGoogle DNS\n13335\tCloudflare\n")
+        self.assertEqual(known_asns, {"15169": ["Google", "Google DNS"], "13335": ["Cloudflare"]})
+
+    def test_rejects_line_without_tab(self):
+        with self.assertRaisesRegex(ValueError, r"known_asns\.tsv:2: "):
+            self.load_from("15169\tGoogle\n13335    Cloudflare\n")
+
+    def test_rejects_non_numeric_asn(self):
+        with self.assertRaisesRegex(ValueError, r"known_asns\.tsv:1: "):
+            self.load_from("AS15169\tGoogle\n")
+
+
+class WriteDatabaseTests(unittest.TestCase):
+
+    def test_entries_are_sorted_numerically(self):
+        database = {"version": "1.0.0", "entries": {"1000": ("b", "NSP"), "99": ("a", "NSP"), "100": ("c", "NSP")}}
+        f = io.BytesIO()
+        gen.write_database(database, f)
+        self.assertEqual(list(json.loads(f.getvalue())["entries"]), ["99", "100", "1000"])
+
+    def test_atomic_write_keeps_old_file_on_failure(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "file.json"
+            path.write_bytes(b"old")
+            with self.assertRaises(RuntimeError):
+                with gen.atomic_write(path) as f:
+                    f.write(b"partial")
+                    raise RuntimeError
+            self.assertEqual(path.read_bytes(), b"old")
+            self.assertEqual(list(Path(tmp_dir).glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()